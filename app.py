@@ -2,28 +2,39 @@
 # -*- coding: utf-8 -*-
 """
 app.py - CCTV Inteligente (versión final)
-- YOLOv8 (ultralytics)
+- YOLOv8 (ultralytics) con backend intercambiable: torch / onnxruntime / opencv / openvino (detectors.py)
 - Tracker: ByteTrack (por defecto), DeepSORT (fallback), o ambos en modo diagnóstico
 - Face recognition (face_recognition)
 - GUI PyQt5: árbol Edificio>Habitación>Cámara, panóptico, vista individual, consola logs
 - Enroll GUI + register_face helper
 - Reporter thread + Flask API
 - TTS (pyttsx3) + Telegram + upload hooks (rclone / s3)
+- Bus de frames en memoria compartida por cámara (framebus.py) + /api/cameras/<name>/snapshot
+- Arranque rápido: modelo, trackers y rostros cargan en segundo plano (/api/status)
 """
-import os, sys, json, time, sqlite3, threading, subprocess, traceback, math
+import os, sys, json, time, sqlite3, threading, subprocess, traceback, math, queue
 from pathlib import Path
 from collections import deque, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
+# Tiempos de arranque por componente (segundos), visibles en /api/status
+_T0 = time.perf_counter()
+startup_times = {}
+
+def _mark(name, t_start):
+    startup_times[name] = round(time.perf_counter() - t_start, 3)
+
+_t = time.perf_counter()
 import cv2
 import numpy as np
-from ultralytics import YOLO
-import face_recognition
-import pyttsx3
-import pandas as pd
 import requests
 
 from PyQt5 import QtWidgets, QtGui, QtCore
-from flask import Flask, jsonify
+from flask import Flask, jsonify, Response
+
+from framebus import FrameBus, BUSES, get_bus
+from synthetic import open_source
+_mark("imports_base", _t)
 
 # ----------------------- Paths & constants -----------------------
 BASE = Path(__file__).parent
@@ -41,32 +52,136 @@ for p in (FACES_DIR, EVID_DIR, RECORD_DIR, REPORTS_DIR, CONFIG_HISTORY):
 # Configurable via env:
 TRACKER_DEFAULT = os.getenv("TRACKER", "bytetrack").lower()
 MODEL_WEIGHTS = os.getenv("YOLO_WEIGHTS", "yolov8n.pt")
+DETECTOR_BACKEND = os.getenv("DETECTOR_BACKEND", "torch").lower()  # torch | onnxruntime | opencv | openvino
 ALERT_COOLDOWN = float(os.getenv("ALERT_COOLDOWN", "8"))
 BUFFER_SECONDS = int(os.getenv("BUFFER_SECONDS", "30"))
 PROCESS_EVERY_N_FRAMES = int(os.getenv("PROCESS_EVERY_N_FRAMES", "3"))
-UPLOAD_METHOD = os.getenv("UPLOAD_METHOD","")
+UPLOAD_METHOD = os.getenv("UPLOAD_METHOD","")  # rclone | s3 | http
+UPLOAD_URL = os.getenv("UPLOAD_URL","")  # UPLOAD_METHOD=http (p.ej. fake_sink.py)
+RCLONE_REMOTE = os.getenv("RCLONE_REMOTE","")
+S3_BUCKET = os.getenv("S3_BUCKET","")
+TELEGRAM_API = os.getenv("TELEGRAM_API","https://api.telegram.org")
 TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN","")
 TELEGRAM_CHAT  = os.getenv("TELEGRAM_CHAT","")
+TTS_ENABLED = os.getenv("TTS_ENABLED","true").lower() in ("1","true","yes")
 COMPARE_TRACKERS = os.getenv("COMPARE_TRACKERS","false").lower() in ("1","true","yes")
-
-# ----------------------- Load model -----------------------
-print("Cargando YOLO:", MODEL_WEIGHTS)
-model = YOLO(MODEL_WEIGHTS)
-
-# ----------------------- Tracker imports -----------------------
+# GUI: miniaturas del panóptico y vista individual a FPS limitado
+PREVIEW_FPS = float(os.getenv("PREVIEW_FPS", "5"))  # <= 0: sin límite
+SINGLE_FPS = float(os.getenv("SINGLE_FPS", "15"))  # <= 0: sin límite
+PREVIEW_INTERVAL = 1.0/PREVIEW_FPS if PREVIEW_FPS > 0 else 0.0
+SINGLE_INTERVAL = 1.0/SINGLE_FPS if SINGLE_FPS > 0 else 0.0
+PREVIEW_W, PREVIEW_H = 480, 320
+
+# ----------------------- Warm-up (carga diferida) -----------------------
+# ultralytics, face_recognition y los trackers tardan decenas de segundos en
+# importarse/cargar. Se cargan en paralelo en segundo plano: GUI y API arrancan
+# al instante y los workers solo muestran video hasta que warmup_done se activa.
+model = None
+face_recognition = None
+BYTETracker = None
+DeepSort = None
 use_bytetrack = False
 use_deepsort = False
-try:
-    from yolox.tracker.byte_tracker import BYTETracker
-    use_bytetrack = True
-except Exception:
-    pass
-
-try:
-    from deep_sort_realtime.deepsort_tracker import DeepSort
-    use_deepsort = True
-except Exception:
-    pass
+warmup_done = threading.Event()
+_warmup_lock = threading.Lock()
+_warmup_started = False
+
+def _load_model():
+    global model
+    from detectors import create_detector
+    print("Cargando YOLO:", MODEL_WEIGHTS, "backend:", DETECTOR_BACKEND)
+    model = create_detector(DETECTOR_BACKEND, MODEL_WEIGHTS)
+
+def _load_trackers():
+    global BYTETracker, DeepSort, use_bytetrack, use_deepsort
+    errs = []
+    try:
+        from yolox.tracker.byte_tracker import BYTETracker as _bt
+        BYTETracker, use_bytetrack = _bt, True
+    except Exception as e:
+        errs.append(f"bytetrack: {type(e).__name__}: {e}")
+    try:
+        from deep_sort_realtime.deepsort_tracker import DeepSort as _ds
+        DeepSort, use_deepsort = _ds, True
+    except Exception as e:
+        errs.append(f"deepsort: {type(e).__name__}: {e}")
+    # basta con uno de los dos; sin ninguno no hay tracks, eventos ni alertas
+    if not (use_bytetrack or use_deepsort):
+        raise RuntimeError("Ningún tracker disponible (" + "; ".join(errs) + ")")
+
+def _load_faces():
+    global face_recognition
+    import face_recognition as _fr
+    face_recognition = _fr
+    reload_known_faces()
+
+WARMUP_STEPS = {"modelo": _load_model, "trackers": _load_trackers, "rostros": _load_faces}
+warmup_errors = {}  # componente -> error; si hay alguno el estado es "degraded"
+
+def _timed_step(name, fn):
+    t = time.perf_counter()
+    try:
+        fn()
+    except Exception as e:
+        warmup_errors[name] = f"{type(e).__name__}: {e}"
+        print(f"Warm-up '{name}' falló:", e); traceback.print_exc()
+    finally:
+        _mark(name, t)
+
+def start_warmup():
+    """Carga modelo, trackers e índice de rostros en paralelo (una sola vez)."""
+    global _warmup_started
+    with _warmup_lock:
+        if _warmup_started:
+            return
+        _warmup_started = True
+    def _run():
+        with ThreadPoolExecutor(max_workers=len(WARMUP_STEPS)) as ex:
+            for name, fn in WARMUP_STEPS.items():
+                ex.submit(_timed_step, name, fn)
+        startup_times["total_listo"] = round(time.perf_counter() - _T0, 3)
+        warmup_done.set()
+        print("Tiempos de arranque (s):", json.dumps(startup_times, ensure_ascii=False))
+    threading.Thread(target=_run, name="warmup", daemon=True).start()
+
+def warmup_status():
+    if not warmup_done.is_set():
+        state = "warming_up"
+    else:
+        state = "degraded" if warmup_errors else "ready"
+    return {"state": state, "detector": getattr(model, "name", None), "errors": dict(warmup_errors),
+            "startup_times": dict(startup_times)}
+
+# TTS: hilo propio alimentado por una cola; pyttsx3 se inicializa en la primera alerta.
+# speak() no bloquea a los workers; si la cola está llena el aviso se descarta.
+_tts_queue = queue.Queue(maxsize=8)
+_tts_thread = None
+_tts_thread_lock = threading.Lock()
+
+def _tts_loop():
+    engine = None
+    while True:
+        text = _tts_queue.get()
+        try:
+            if engine is None:
+                import pyttsx3
+                engine = pyttsx3.init()
+            engine.say(text)
+            engine.runAndWait()
+        except Exception as e:
+            print("TTS error", e)
+
+def speak(text):
+    global _tts_thread
+    if not TTS_ENABLED: return
+    with _tts_thread_lock:
+        if _tts_thread is None:
+            _tts_thread = threading.Thread(target=_tts_loop, name="tts", daemon=True)
+            _tts_thread.start()
+    try:
+        _tts_queue.put_nowait(text)
+    except queue.Full:
+        pass
 
 # ----------------------- Tracker wrapper -----------------------
 class TrackerWrapper:
@@ -131,8 +246,6 @@ def reload_known_faces():
     except Exception as e:
         print("reload_known_faces error", e)
 
-reload_known_faces()
-
 # Buffer & summarizer
 event_buffer = deque()
 
@@ -161,7 +274,48 @@ if COMPARE_TRACKERS:
     if not COMPARE_CSV.exists():
         COMPARE_CSV.write_text("ts,camera,frame_idx,bytetrack_count,deepsort_count,bytetrack_ids,deepsort_ids\n", encoding="utf-8")
 
-# helper upload (stub)
+# ----------------------- DB / alert sinks -----------------------
+def ensure_db():
+    import db_init
+    conn = sqlite3.connect(DB_PATH)
+    db_init.create_tables(conn)
+    conn.close()
+
+def log_event(camera, track_id, person_name, role, confidence, bbox, evidence):
+    try:
+        conn = sqlite3.connect(DB_PATH, timeout=10)
+        conn.execute("INSERT INTO events (ts, camera, track_id, person_name, role, confidence, bbox, evidence) VALUES (?,?,?,?,?,?,?,?)",
+                     (time.strftime("%Y-%m-%d %H:%M:%S"), camera, str(track_id), person_name, role, confidence, json.dumps(bbox), evidence))
+        conn.commit(); conn.close()
+    except Exception as e:
+        print("log_event error", e)
+
+def send_telegram(text, img_path=""):
+    base = f"{TELEGRAM_API.rstrip('/')}/bot{TELEGRAM_TOKEN}"
+    try:
+        if img_path and Path(img_path).exists():
+            with open(img_path, "rb") as f:
+                requests.post(f"{base}/sendPhoto", data={"chat_id": TELEGRAM_CHAT, "caption": text}, files={"photo": f}, timeout=10)
+        else:
+            requests.post(f"{base}/sendMessage", data={"chat_id": TELEGRAM_CHAT, "text": text}, timeout=10)
+    except Exception as e:
+        print("telegram error", e)
+
+def upload_file(path, dest=None):
+    name = dest or Path(path).name
+    if UPLOAD_METHOD == "rclone":
+        subprocess.run(["rclone", "copyto", str(path), f"{RCLONE_REMOTE}/{name}"], check=True)
+    elif UPLOAD_METHOD == "s3":
+        import boto3
+        boto3.client("s3", endpoint_url=os.getenv("S3_ENDPOINT") or None).upload_file(str(path), S3_BUCKET, name)
+    elif UPLOAD_METHOD == "http":
+        with open(path, "rb") as f:
+            requests.put(f"{UPLOAD_URL.rstrip('/')}/{name}", data=f, timeout=30).raise_for_status()
+    else:
+        return False
+    return True
+
+# helper upload
 def safe_upload(path):
     try:
         return upload_file(path, None)
@@ -169,9 +323,61 @@ def safe_upload(path):
         print("upload error", e)
         return False
 
+# ----------------------- Pipeline metrics -----------------------
+class PipelineStats:
+    """Latencia captura->fin de procesamiento y FPS por cámara desde el último reset()."""
+    def __init__(self, maxlen=2000):
+        self.lock = threading.Lock()
+        self.maxlen = maxlen
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.t0 = time.time()
+            self.captured = defaultdict(int)
+            self.processed = defaultdict(int)
+            self.detections = defaultdict(int)
+            self.events = defaultdict(int)
+            self.faces = defaultdict(int)
+            self.samples = defaultdict(lambda: deque(maxlen=self.maxlen))  # cam -> (latency_ms, detect_ms)
+
+    def frame(self, cam):
+        with self.lock:
+            self.captured[cam] += 1
+
+    def record(self, cam, latency_ms, detect_ms, detections=0, events=0, faces=0):
+        with self.lock:
+            self.processed[cam] += 1
+            self.detections[cam] += detections
+            self.events[cam] += events
+            self.faces[cam] += faces
+            self.samples[cam].append((latency_ms, detect_ms))
+
+    def snapshot(self):
+        with self.lock:
+            dur = max(1e-6, time.time() - self.t0)
+            cams = {}
+            all_lat = []
+            for cam in set(self.captured) | set(self.processed):
+                s = np.array(self.samples[cam], dtype=np.float64).reshape(-1, 2)
+                all_lat.append(s[:, 0])
+                cams[cam] = {"captured_fps": round(self.captured[cam] / dur, 2), "processed_fps": round(self.processed[cam] / dur, 2),
+                             "processed": self.processed[cam], "detections": self.detections[cam],
+                             "events": self.events[cam], "faces": self.faces[cam],
+                             **_lat_summary(s[:, 0]), "detect_ms": round(float(s[:, 1].mean()), 1) if len(s) else None}
+        lat = np.concatenate(all_lat) if all_lat else np.empty(0)
+        return {"window_s": round(dur, 2), "cameras": cams, "total": _lat_summary(lat)}
+
+def _lat_summary(lat):
+    if not len(lat):
+        return {"n": 0, "p50_ms": None, "p95_ms": None, "max_ms": None}
+    return {"n": int(len(lat)), "p50_ms": round(float(np.percentile(lat, 50)), 1),
+            "p95_ms": round(float(np.percentile(lat, 95)), 1), "max_ms": round(float(lat.max()), 1)}
+
+pipeline_stats = PipelineStats()
+
 # CameraWorker with optional compare mode
 class CameraWorker(QtCore.QThread):
-    frame_signal = QtCore.pyqtSignal(object, str)
     alert_signal = QtCore.pyqtSignal(dict)
 
     def __init__(self, cam_id, source, tracker_mode=None, process_every=PROCESS_EVERY_N_FRAMES):
@@ -184,10 +390,49 @@ class CameraWorker(QtCore.QThread):
         self.tracker_mode = tracker_mode
         self.process_idx = 0
         self.last_alert = {}
+        self.primary_tracker = None
+        self.secondary_tracker = None
+        self.trackers_ready = False
+        # preview: el worker deja solo el último frame listo para pintar (QImage RGB);
+        # la GUI lo recoge con un timer (coalescing) y solo si el tile es visible
+        self.preview_enabled = True
+        self.full_enabled = False
+        self.latest = {}  # "preview"/"full" -> (seq, QImage, buffer)
+        self.bus = None  # FrameBus: se crea con el primer frame (capacidad = tamaño del frame)
+        self._seq = 0
+        self._last_pub = {"preview": 0.0, "full": 0.0}
+
+    def set_view(self, preview=None, full=None):
+        if preview is not None: self.preview_enabled = preview
+        if full is not None:
+            self.full_enabled = full
+            if not full: self.latest.pop("full", None)
+
+    def _store(self, kind, bgr):
+        rgb = cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+        h, w, ch = rgb.shape
+        qimg = QtGui.QImage(rgb.data, w, h, ch*w, QtGui.QImage.Format_RGB888)
+        self._seq += 1
+        self.latest[kind] = (self._seq, qimg, rgb)  # rgb mantiene vivo el buffer del QImage
+
+    def publish(self, frame):
+        now = time.time()
+        if self.preview_enabled and now - self._last_pub["preview"] >= PREVIEW_INTERVAL:
+            self._last_pub["preview"] = now
+            h, w = frame.shape[:2]; r = min(PREVIEW_W/w, PREVIEW_H/h, 1.0)
+            small = cv2.resize(frame, (max(1,int(w*r)), max(1,int(h*r))), interpolation=cv2.INTER_AREA) if r < 1.0 else frame
+            self._store("preview", small)
+        if self.full_enabled and now - self._last_pub["full"] >= SINGLE_INTERVAL:
+            self._last_pub["full"] = now
+            self._store("full", frame)
+
+    def init_trackers(self):
+        # se llama tras el warm-up: las clases de tracker se importan en segundo plano
+        self.trackers_ready = True
         # trackers: primary and secondary for compare
         try:
             # primary tracker per-camera/hint
-            self.primary_tracker = TrackerWrapper(mode_hint=tracker_mode)
+            self.primary_tracker = TrackerWrapper(mode_hint=self.tracker_mode)
         except Exception as e:
             print(f"[{self.cam_id}] Primary tracker init failed:", e); self.primary_tracker = None
         self.secondary_tracker = None
@@ -202,29 +447,43 @@ class CameraWorker(QtCore.QThread):
                 print(f"[{self.cam_id}] Compare init failed:", e)
                 self.secondary_tracker = None
 
+    def read_frame(self):
+        # decodifica una sola vez en el bus compartido; devuelve (ret, FrameRef retenido | None)
+        if self.bus is None:
+            ret, frame = self.cap.read()
+            if not ret:
+                return False, None
+            self.bus = FrameBus(self.cam_id, capacity=frame.nbytes)
+            BUSES[self.cam_id] = self.bus
+            return True, self.bus.write(frame)
+        return self.bus.capture(self.cap)
+
     def run(self):
-        self.cap = cv2.VideoCapture(self.source)
+        self.cap = open_source(self.source)
         while self.running:
             if not self.cap.isOpened():
                 time.sleep(0.5)
-                self.cap = cv2.VideoCapture(self.source)
+                self.cap = open_source(self.source)
                 continue
-            ret, frame = self.cap.read()
+            ret, ref = self.read_frame()
             if not ret:
                 time.sleep(0.02)
                 continue
+            if ref is None:
+                continue  # todos los slots retenidos por consumidores: frame descartado
+            frame = ref.array  # vista zero-copy del slot
+            pipeline_stats.frame(self.cam_id)
             self.process_idx += 1
-            if self.process_idx % self.process_every == 0:
+            if self.process_idx % self.process_every == 0 and warmup_done.is_set() and model is not None:
+                if not self.trackers_ready:
+                    self.init_trackers()
+                det_ms = 0.0
+                dets = []
+                n_events = n_faces = 0
                 try:
-                    preds = model(frame, verbose=False)
-                    dets = []
-                    for r in preds:
-                        boxes = getattr(r, "boxes").xyxy.cpu().numpy()
-                        confs = getattr(r, "boxes").conf.cpu().numpy()
-                        clss = getattr(r, "boxes").cls.cpu().numpy()
-                        for (x1,y1,x2,y2),conf,cls in zip(boxes, confs, clss):
-                            if int(cls)==0 and conf>0.35:
-                                dets.append([int(x1),int(y1),int(x2),int(y2),float(conf),int(cls)])
+                    t_det = time.perf_counter()
+                    dets = model.detect(frame)
+                    det_ms = (time.perf_counter() - t_det) * 1000
                     # primary tracker update
                     if self.primary_tracker:
                         tracks = self.primary_tracker.update(dets, frame=frame)
@@ -263,6 +522,7 @@ class CameraWorker(QtCore.QThread):
                             try:
                                 rgb = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)
                                 encs = face_recognition.face_encodings(rgb)
+                                n_faces += 1
                                 if encs:
                                     dists = face_recognition.face_distance(known_encodings, encs[0])
                                     idxm = int(np.argmin(dists))
@@ -280,6 +540,7 @@ class CameraWorker(QtCore.QThread):
                             if UPLOAD_METHOD:
                                 threading.Thread(target=safe_upload, args=(evpath,), daemon=True).start()
                         log_event(self.cam_id, tid, name, role, 0.0, [x1,y1,x2,y2], evpath)
+                        n_events += 1
                         evt = {"ts": time.strftime("%Y-%m-%d %H:%M:%S"), "camera": self.cam_id, "track_id": tid, "person_name": name, "role": role, "bbox":[x1,y1,x2,y2], "evidence": evpath}
                         add_to_buffer(evt)
                         self.alert_signal.emit(evt)
@@ -291,10 +552,14 @@ class CameraWorker(QtCore.QThread):
                                 threading.Thread(target=send_telegram, args=(f"Alerta desconocido en {self.cam_id}", evpath), daemon=True).start()
                 except Exception as e:
                     print("Worker processing error:", e); traceback.print_exc()
-            # emit frame for GUI (unprocessed)
-            self.frame_signal.emit(frame, self.cam_id)
+                pipeline_stats.record(self.cam_id, (time.time() - ref.ts) * 1000, det_ms, len(dets), n_events, n_faces)
+            # preview for GUI (unprocessed, downscaled/capped, only if visible)
+            self.publish(frame)
+            ref.release()
         if self.cap:
             self.cap.release()
+        if self.bus:
+            self.bus.close()
 
     def stop(self):
         self.running = False
@@ -304,6 +569,7 @@ api = Flask("cctv_api")
 
 @api.route("/api/events")
 def api_events():
+    import pandas as pd
     conn = sqlite3.connect(DB_PATH)
     df = pd.read_sql("SELECT * FROM events ORDER BY id DESC LIMIT 500", conn)
     conn.close()
@@ -315,6 +581,47 @@ def api_cameras():
         return CAM_CONF.read_text(encoding="utf-8")
     return jsonify({"buildings":[]})
 
+@api.route("/api/cameras/<name>/snapshot")
+def api_snapshot(name):
+    # último frame desde el bus compartido (sin decodificar de nuevo)
+    bus = get_bus(name)
+    if bus is None:
+        return jsonify({"error": f"cámara '{name}' sin bus de frames"}), 404
+    ok = valid = False
+    try:
+        # adjuntado desde otro proceso no hay retención: reintentar si el slot se
+        # está reescribiendo (latest() None con frames ya publicados) o se
+        # reescribió mientras se codificaba (seq distinto => frame roto)
+        for _ in range(5):
+            ref = bus.latest()
+            if ref is None:
+                if not bus.has_frames():
+                    return jsonify({"error": f"cámara '{name}' aún sin frames"}), 503
+                time.sleep(0.002)
+                continue
+            with ref:
+                ok, jpg = cv2.imencode(".jpg", ref.array)
+                valid = ref.valid()
+            if valid:
+                break
+            time.sleep(0.002)
+    finally:
+        if bus is not BUSES.get(name):
+            bus.close()  # adjuntado desde otro proceso solo para esta petición
+    if not valid:
+        return jsonify({"error": f"cámara '{name}': frame sobrescrito durante la lectura"}), 503
+    if not ok:
+        return jsonify({"error": "error codificando JPEG"}), 500
+    return Response(jpg.tobytes(), mimetype="image/jpeg")
+
+@api.route("/api/metrics")
+def api_metrics():
+    return jsonify(pipeline_stats.snapshot())
+
+@api.route("/api/status")
+def api_status():
+    return jsonify(warmup_status())
+
 def run_api():
     api.run(host="0.0.0.0", port=5000, threaded=True)
 
@@ -339,15 +646,23 @@ class MainWindow(QtWidgets.QMainWindow):
         top.addWidget(left, 2)
         # center: stack (panopticon / single)
         self.stack = QtWidgets.QStackedWidget()
-        self.panoptic = QtWidgets.QWidget(); self.grid = QtWidgets.QGridLayout(self.panoptic)
+        # panóptico dentro de un QScrollArea: los tiles fuera del viewport quedan
+        # recortados (visibleRegion vacío) y dejan de producir miniaturas
+        self.panoptic = QtWidgets.QScrollArea(); self.panoptic.setWidgetResizable(True)
+        grid_host = QtWidgets.QWidget(); self.grid = QtWidgets.QGridLayout(grid_host)
+        self.grid.setAlignment(QtCore.Qt.AlignTop | QtCore.Qt.AlignLeft)
+        self.panoptic.setWidget(grid_host)
         self.stack.addWidget(self.panoptic)
         self.single = QtWidgets.QLabel("Seleccione una cámara"); self.single.setAlignment(QtCore.Qt.AlignCenter)
+        self.single.setMinimumSize(1, 1)
         self.stack.addWidget(self.single)
         top.addWidget(self.stack, 6)
         # right: controls & logs
         right = QtWidgets.QWidget(); r_l = QtWidgets.QVBoxLayout(right)
         self.btn_reload = QtWidgets.QPushButton("Recargar cámaras"); self.btn_reload.clicked.connect(self.load_cameras)
         r_l.addWidget(self.btn_reload)
+        self.btn_panoptic = QtWidgets.QPushButton("Vista panóptica"); self.btn_panoptic.clicked.connect(self.show_panoptic)
+        r_l.addWidget(self.btn_panoptic)
         self.btn_summary = QtWidgets.QPushButton("Resumen 30s"); self.btn_summary.clicked.connect(self.show_summary)
         r_l.addWidget(self.btn_summary)
         self.btn_export = QtWidgets.QPushButton("Exportar events CSV"); self.btn_export.clicked.connect(self.export_events)
@@ -361,12 +676,34 @@ class MainWindow(QtWidgets.QMainWindow):
         # state
         self.workers = {}
         self.labels = {}
+        self.selected_cam = None
+        self.painted = {}  # cam/"__single__" -> último seq pintado
+        # render: un solo timer pinta el último frame de cada tile visible
+        self.render_timer = QtCore.QTimer(self); self.render_timer.timeout.connect(self.render_tick)
+        fps = max(PREVIEW_FPS, SINGLE_FPS)
+        self.render_timer.start(int(1000 / fps) if fps > 0 else 33)
+        # warm-up status
+        self.statusBar().showMessage("Calentando modelos (YOLO, trackers, rostros)...")
+        self.warmup_timer = QtCore.QTimer(self); self.warmup_timer.timeout.connect(self.check_warmup)
+        self.warmup_timer.start(500)
         # load cameras
         self.load_cameras()
-        # start API and reporter
-        threading.Thread(target=run_api, daemon=True).start()
+        # start reporter (API se lanza en main)
         threading.Thread(target=self.reporter_loop, daemon=True).start()
 
+    def check_warmup(self):
+        if not warmup_done.is_set(): return
+        self.warmup_timer.stop()
+        parts = ", ".join(f"{k}={v}s" for k,v in startup_times.items())
+        if warmup_errors:
+            errs = "; ".join(f"{k}: {v}" for k,v in warmup_errors.items())
+            self.statusBar().showMessage(f"DEGRADADO ({', '.join(warmup_errors)} no disponible). Arranque: {parts}")
+            self.statusBar().setStyleSheet("background:#b00020;color:white")
+            self.log(f"Warm-up con errores: {errs}")
+            return
+        self.statusBar().showMessage(f"Listo. Arranque: {parts}")
+        self.log(f"Warm-up completo: {parts}")
+
     def reporter_loop(self):
         while True:
             try:
@@ -380,7 +717,8 @@ class MainWindow(QtWidgets.QMainWindow):
         for w in list(self.workers.values()):
             try: w.stop()
             except: pass
-        self.workers.clear(); self.labels.clear()
+        self.workers.clear(); self.labels.clear(); self.painted.clear()
+        self.selected_cam = None; self.stack.setCurrentWidget(self.panoptic)
         # clear grid and tree
         self.tree.clear()
         while self.grid.count():
@@ -404,6 +742,7 @@ class MainWindow(QtWidgets.QMainWindow):
                     rnode.addChild(cnode)
                     # grid widget
                     lbl = QtWidgets.QLabel(cam.get("name")); lbl.setStyleSheet("background:black;color:white"); lbl.setAlignment(QtCore.Qt.AlignCenter)
+                    lbl.setFixedSize(PREVIEW_W, PREVIEW_H)  # tamaño de celda fijo: el pixmap no hace crecer la rejilla
                     idx = self.grid.count(); r_idx = idx//2; c_idx = idx%2
                     self.grid.addWidget(lbl, r_idx, c_idx)
                     self.labels[cam.get("name")] = lbl
@@ -412,7 +751,6 @@ class MainWindow(QtWidgets.QMainWindow):
                     src = int(src) if isinstance(src, str) and src.isdigit() else src
                     tmode = cam.get("tracker") or None
                     w = CameraWorker(cam.get("name"), src, tracker_mode=tmode)
-                    w.frame_signal.connect(lambda f, l=lbl, name=cam.get("name"): self.on_frame(f,l,name))
                     w.alert_signal.connect(self.on_alert)
                     w.start()
                     self.workers[cam.get("name")] = w
@@ -422,19 +760,44 @@ class MainWindow(QtWidgets.QMainWindow):
     def on_tree_item(self, item, col):
         cam = item.data(0, QtCore.Qt.UserRole)
         if cam:
-            name = cam.get("name")
-            lbl = self.labels.get(name)
+            self.selected_cam = cam.get("name")
+            self.painted.pop("__single__", None)
+            lbl = self.labels.get(self.selected_cam)
             if lbl and lbl.pixmap():
                 self.single.setPixmap(lbl.pixmap().scaled(self.single.width(), self.single.height(), QtCore.Qt.KeepAspectRatio))
-                self.stack.setCurrentWidget(self.single)
-
-    def on_frame(self, frame, label_widget, cam_name):
-        if frame is None: return
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        h,w,ch = rgb.shape
-        qimg = QtGui.QImage(rgb.data, w, h, ch*w, QtGui.QImage.Format_RGB888)
-        pix = QtGui.QPixmap.fromImage(qimg).scaled(480,320, QtCore.Qt.KeepAspectRatio)
-        label_widget.setPixmap(pix)
+            self.stack.setCurrentWidget(self.single)
+            self.update_visibility()
+
+    def show_panoptic(self):
+        self.selected_cam = None
+        self.stack.setCurrentWidget(self.panoptic)
+        self.update_visibility()
+
+    def update_visibility(self):
+        # solo los tiles visibles producen miniaturas; solo la cámara seleccionada, resolución completa
+        single = self.stack.currentWidget() is self.single
+        hidden = self.isMinimized() or not self.isVisible()
+        for name, w in self.workers.items():
+            lbl = self.labels.get(name)
+            tile_visible = not (hidden or single) and lbl is not None and not lbl.visibleRegion().isEmpty()
+            w.set_view(preview=tile_visible, full=(single and not hidden and name == self.selected_cam))
+
+    def render_tick(self):
+        self.update_visibility()
+        if self.stack.currentWidget() is self.single:
+            w = self.workers.get(self.selected_cam)
+            item = w.latest.get("full") if w else None
+            if item and item[0] != self.painted.get("__single__"):
+                self.painted["__single__"] = item[0]
+                pix = QtGui.QPixmap.fromImage(item[1]).scaled(self.single.width(), self.single.height(), QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+                self.single.setPixmap(pix)
+            return
+        for name, w in self.workers.items():
+            if not w.preview_enabled: continue
+            item = w.latest.get("preview")
+            if item and item[0] != self.painted.get(name):
+                self.painted[name] = item[0]
+                self.labels[name].setPixmap(QtGui.QPixmap.fromImage(item[1]))
 
     def on_alert(self, alert):
         line = f"[{alert.get('ts')}] {alert.get('camera')} - {alert.get('person_name')} ({alert.get('role')})"
@@ -478,6 +841,7 @@ class MainWindow(QtWidgets.QMainWindow):
         QtWidgets.QMessageBox.information(self, "Resumen 30s", s)
 
     def export_events(self):
+        import pandas as pd
         conn = sqlite3.connect(DB_PATH)
         df = pd.read_sql("SELECT * FROM events ORDER BY id DESC LIMIT 10000", conn)
         conn.close()
@@ -493,13 +857,17 @@ class MainWindow(QtWidgets.QMainWindow):
 
 # ----------------------- Entrypoint -----------------------
 def main():
-    reload_known_faces()
+    # modelo/trackers/rostros cargan en segundo plano; GUI y API arrancan ya
+    start_warmup()
     ensure_db()
+    # start API thread
+    threading.Thread(target=run_api, daemon=True).start()
+    t = time.perf_counter()
     app = QtWidgets.QApplication(sys.argv)
     mw = MainWindow()
     mw.show()
-    # start API thread
-    threading.Thread(target=run_api, daemon=True).start()
+    _mark("gui", t)
+    startup_times["gui_visible"] = round(time.perf_counter() - _T0, 3)
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+bench_detectors.py - Compara backends de detección (detectors.py) en CPU
+
+Usos:
+  python bench_detectors.py                                   # todos los backends, frames sintéticos
+  python bench_detectors.py --source video.mp4 --frames 300
+  python bench_detectors.py --backends torch,onnxruntime --int8
+
+Mide tiempo de carga (incluye export), latencia media/p50/p95, FPS y
+detecciones medias por frame. Guarda resultados en reports/bench_detectors.csv.
+"""
+import argparse, csv, os, time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from detectors import BACKENDS, DETECTOR_IMGSZ, create_detector
+
+BASE = Path(__file__).parent
+OUT = BASE / "reports" / "bench_detectors.csv"
+
+def load_frames(source, n, width=1280, height=720):
+    frames = []
+    if source:
+        cap = cv2.VideoCapture(int(source) if source.isdigit() else source)
+        while len(frames) < n:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frames.append(frame)
+        cap.release()
+        if not frames:
+            raise SystemExit(f"No se pudieron leer frames de {source}")
+    else:
+        rng = np.random.default_rng(0)
+        frames = [rng.integers(0, 255, (height, width, 3), dtype=np.uint8) for _ in range(min(n, 16))]
+    return frames
+
+def bench(backend, weights, frames, n, warmup, imgsz, int8):
+    t = time.perf_counter()
+    det = create_detector(backend, weights, imgsz=imgsz, int8=int8)
+    load_s = time.perf_counter() - t
+    for i in range(warmup):
+        det.detect(frames[i % len(frames)])
+    lat, ndet = [], 0
+    for i in range(n):
+        t = time.perf_counter()
+        ndet += len(det.detect(frames[i % len(frames)]))
+        lat.append((time.perf_counter() - t) * 1000)
+    lat = np.asarray(lat)
+    return {"backend": backend, "used": det.name, "int8": int8, "imgsz": imgsz,
+            "load_s": round(load_s, 2), "mean_ms": round(lat.mean(), 2),
+            "p50_ms": round(float(np.percentile(lat, 50)), 2), "p95_ms": round(float(np.percentile(lat, 95)), 2),
+            "fps": round(1000 / lat.mean(), 1), "dets_per_frame": round(ndet / n, 2)}
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark de backends de detección")
+    ap.add_argument("--backends", default=",".join(BACKENDS))
+    ap.add_argument("--weights", default=os.getenv("YOLO_WEIGHTS", "yolov8n.pt"))
+    ap.add_argument("--source", default="", help="video/cámara; vacío = frames sintéticos")
+    ap.add_argument("--frames", type=int, default=100)
+    ap.add_argument("--warmup", type=int, default=5)
+    ap.add_argument("--imgsz", type=int, default=DETECTOR_IMGSZ)
+    ap.add_argument("--int8", action="store_true")
+    args = ap.parse_args()
+
+    frames = load_frames(args.source, args.frames)
+    rows = []
+    for b in [x.strip() for x in args.backends.split(",") if x.strip()]:
+        try:
+            rows.append(bench(b, args.weights, frames, args.frames, args.warmup, args.imgsz, args.int8))
+        except Exception as e:
+            print(f"[{b}] error:", e)
+    if not rows:
+        return
+    print()
+    cols = list(rows[0].keys())
+    print(" | ".join(f"{c:>14}" for c in cols))
+    for r in rows:
+        print(" | ".join(f"{str(r[c]):>14}" for c in cols))
+    OUT.parent.mkdir(parents=True, exist_ok=True)
+    new = not OUT.exists()
+    with open(OUT, "a", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=["ts"] + cols)
+        if new:
+            w.writeheader()
+        ts = time.strftime("%Y-%m-%d %H:%M:%S")
+        for r in rows:
+            w.writerow({"ts": ts, **r})
+    print("\nResultados añadidos a", OUT)
+
+if __name__ == "__main__":
+    main()
@@ -12,12 +12,8 @@ from pathlib import Path
 
 DB = Path(__file__).parent / "people.db"
 
-def create_db():
-    if DB.exists():
-        print("⚠ people.db ya existe. Se renombra a people.db.bak")
-        DB.rename(DB.with_suffix(".db.bak"))
-
-    conn = sqlite3.connect(DB)
+def create_tables(conn):
+    """Crea las tablas si no existen (también lo usa app.py al arrancar)."""
     c = conn.cursor()
 
     c.execute("""
@@ -43,6 +39,16 @@ def create_db():
         evidence TEXT
     )
     """)
+    conn.commit()
+
+def create_db():
+    if DB.exists():
+        print("⚠ people.db ya existe. Se renombra a people.db.bak")
+        DB.rename(DB.with_suffix(".db.bak"))
+
+    conn = sqlite3.connect(DB)
+    c = conn.cursor()
+    create_tables(conn)
 
     # Insertar ejemplos ligeros sin face_path
     try:
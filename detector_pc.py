@@ -1,15 +1,9 @@
 import cv2
-import numpy as np
 
-# Cargar el modelo YOLO
-net = cv2.dnn.readNet("yolov3.weights", "yolov3.cfg")
-classes = []
-with open("coco.names", "r") as f:
-    classes = [line.strip() for line in f.readlines()]
+from detectors import OpenCVDnnDetector
 
-layer_names = net.getLayerNames()
-output_layers = [layer_names[i - 1] for i in net.getUnconnectedOutLayers()]
-colors = np.random.uniform(0, 255, size=(len(classes), 3))
+# Cargar el modelo YOLO (mismo backend OpenCV DNN que usa app.py con DETECTOR_BACKEND=opencv)
+detector = OpenCVDnnDetector("yolov3.weights", cfg="yolov3.cfg", imgsz=416, conf=0.5, iou=0.4)
 
 # (El código de captura de video va aquí)
 cap = cv2.VideoCapture(0)
@@ -19,51 +13,17 @@ while True:
     if not ret:
         break
 
-    height, width, channels = frame.shape
-
-    # --- Detección de objetos ---
-    # Prepara la imagen para YOLO
-    blob = cv2.dnn.blobFromImage(frame, 0.00392, (416, 416), (0, 0, 0), True, crop=False)
-    net.setInput(blob)
-    outs = net.forward(output_layers)
-
-    # --- Procesamiento de las detecciones ---
-    class_ids = []
-    confidences = []
-    boxes = []
-    for out in outs:
-        for detection in out:
-            scores = detection[5:]
-            class_id = np.argmax(scores)
-            confidence = scores[class_id]
-            # Filtramos para detectar solo 'persona' con una confianza > 0.5
-            if classes[class_id] == "person" and confidence > 0.5:
-                # Coordenadas del recuadro
-                center_x = int(detection[0] * width)
-                center_y = int(detection[1] * height)
-                w = int(detection[2] * width)
-                h = int(detection[3] * height)
-
-                # Coordenadas de la esquina superior izquierda
-                x = int(center_x - w / 2)
-                y = int(center_y - h / 2)
-
-                boxes.append([x, y, w, h])
-                confidences.append(float(confidence))
-                class_ids.append(class_id)
+    # --- Detección de personas ---
+    # letterbox/blob, filtro de clase 'persona' (confianza > 0.5) y
+    # "Non-Max Suppression" vectorizado se hacen dentro del detector
+    dets = detector.detect(frame)
 
     # --- Dibujar los recuadros ---
-    # Aplicamos "Non-Max Suppression" para eliminar recuadros duplicados
-    indexes = cv2.dnn.NMSBoxes(boxes, confidences, 0.5, 0.4)
-
     font = cv2.FONT_HERSHEY_PLAIN
-    for i in range(len(boxes)):
-        if i in indexes:
-            x, y, w, h = boxes[i]
-            label = str(classes[class_ids[i]])
-            color = (0, 255, 0) # Verde para los recuadros
-            cv2.rectangle(frame, (x, y), (x + w, y + h), color, 2)
-            cv2.putText(frame, label, (x, y + 30), font, 2, color, 2)
+    for x1, y1, x2, y2, conf, cls in dets:
+        color = (0, 255, 0) # Verde para los recuadros
+        cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
+        cv2.putText(frame, "person", (x1, y1 + 30), font, 2, color, 2)
 
     cv2.imshow("Cámara de Seguridad - Seguimiento IA", frame)
 
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+detectors.py - Backends de detección de personas intercambiables
+
+Backends (env DETECTOR_BACKEND):
+  torch        ultralytics/PyTorch (por defecto, igual que antes)
+  onnxruntime  exporta los pesos a ONNX (opcional INT8) y corre en ONNX Runtime (CPU)
+  opencv       mismo ONNX vía cv2.dnn; también acepta YOLOv3 darknet (.weights + .cfg)
+  openvino     export OpenVINO de ultralytics (CPU Intel)
+
+Todos devuelven detecciones en el formato del pipeline:
+  [[x1, y1, x2, y2, conf, cls], ...]  solo clase 0 (persona)
+
+La entrada es de tamaño fijo (letterbox a DETECTOR_IMGSZ) y la supresión de
+no-máximos está vectorizada en numpy.
+"""
+import os, time, threading
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+DETECTOR_BACKEND = os.getenv("DETECTOR_BACKEND", "torch").lower()
+DETECTOR_IMGSZ = int(os.getenv("DETECTOR_IMGSZ", "640"))
+DETECTOR_INT8 = os.getenv("DETECTOR_INT8", "false").lower() in ("1","true","yes")
+DETECTOR_CONF = float(os.getenv("DETECTOR_CONF", "0.35"))
+DETECTOR_IOU = float(os.getenv("DETECTOR_IOU", "0.45"))
+ORT_THREADS = int(os.getenv("ORT_THREADS", "0"))  # 0 = decide onnxruntime
+
+BACKENDS = ("torch", "onnxruntime", "opencv", "openvino")
+PERSON_CLASS = 0
+
+# ----------------------- Export -----------------------
+def _is_fresh(out, src):
+    return out.exists() and (not src.exists() or out.stat().st_mtime >= src.stat().st_mtime)
+
+def export_onnx(weights, imgsz=DETECTOR_IMGSZ, int8=False):
+    """Exporta pesos .pt a ONNX (entrada fija imgsz) y opcionalmente a INT8.
+    Reutiliza el export si ya existe y es más nuevo que los pesos."""
+    src = Path(weights)
+    if src.suffix == ".onnx":
+        onnx_path = src
+    else:
+        onnx_path = src.with_suffix(".onnx")
+        if not _is_fresh(onnx_path, src):
+            from ultralytics import YOLO
+            print(f"Exportando {src} a ONNX ({imgsz}x{imgsz})...")
+            out = YOLO(str(src)).export(format="onnx", imgsz=imgsz, dynamic=False, simplify=True)
+            onnx_path = Path(out)
+    if not int8:
+        return onnx_path
+    q_path = onnx_path.with_name(onnx_path.stem + ".int8.onnx")
+    if not _is_fresh(q_path, onnx_path):
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        print(f"Cuantizando {onnx_path} a INT8...")
+        quantize_dynamic(str(onnx_path), str(q_path), weight_type=QuantType.QUInt8)
+    return q_path
+
+def export_openvino(weights, imgsz=DETECTOR_IMGSZ, int8=False):
+    src = Path(weights)
+    ov_dir = src.with_name(src.stem + ("_int8" if int8 else "") + "_openvino_model")
+    if ov_dir.exists():
+        return ov_dir
+    from ultralytics import YOLO
+    print(f"Exportando {src} a OpenVINO ({imgsz}x{imgsz})...")
+    return Path(YOLO(str(src)).export(format="openvino", imgsz=imgsz, int8=int8))
+
+# ----------------------- Pre/post-proceso -----------------------
+def letterbox(frame, size):
+    """Redimensiona manteniendo aspecto y rellena a size x size. Devuelve (img, ratio, (padx, pady))."""
+    h, w = frame.shape[:2]
+    r = min(size / h, size / w)
+    nh, nw = int(round(h * r)), int(round(w * r))
+    img = cv2.resize(frame, (nw, nh), interpolation=cv2.INTER_LINEAR) if (nh, nw) != (h, w) else frame
+    top, left = (size - nh) // 2, (size - nw) // 2
+    canvas = np.full((size, size, 3), 114, dtype=np.uint8)
+    canvas[top:top+nh, left:left+nw] = img
+    return canvas, r, (left, top)
+
+def nms(boxes, scores, iou_thr):
+    """NMS voraz vectorizado. boxes: (N,4) xyxy, scores: (N,). Devuelve índices conservados."""
+    if len(boxes) == 0:
+        return np.empty((0,), dtype=np.int64)
+    x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    areas = (x2 - x1).clip(0) * (y2 - y1).clip(0)
+    order = scores.argsort()[::-1]
+    keep = []
+    while order.size:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+        iw = (np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest])).clip(0)
+        ih = (np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest])).clip(0)
+        inter = iw * ih
+        iou = inter / (areas[i] + areas[rest] - inter + 1e-9)
+        order = rest[iou <= iou_thr]
+    return np.asarray(keep, dtype=np.int64)
+
+def _to_dets(boxes, scores, frame_shape):
+    h, w = frame_shape[:2]
+    boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, w)
+    boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, h)
+    return [[int(b[0]), int(b[1]), int(b[2]), int(b[3]), float(s), PERSON_CLASS] for b, s in zip(boxes, scores)]
+
+def postprocess_v8(out, frame_shape, ratio, pad, conf=DETECTOR_CONF, iou=DETECTOR_IOU):
+    """Salida YOLOv8 (1, 4+nc, N): filtra solo persona, deshace letterbox y aplica NMS."""
+    pred = (out[0] if out.ndim == 3 else out).T  # (1, 4+nc, N) -> (N, 4+nc)
+    scores = pred[:, 4 + PERSON_CLASS]
+    m = scores > conf
+    if not m.any():
+        return []
+    cxcywh, scores = pred[m, :4], scores[m]
+    boxes = np.empty_like(cxcywh)
+    boxes[:, :2] = cxcywh[:, :2] - cxcywh[:, 2:] / 2
+    boxes[:, 2:] = cxcywh[:, :2] + cxcywh[:, 2:] / 2
+    boxes[:, [0, 2]] -= pad[0]
+    boxes[:, [1, 3]] -= pad[1]
+    boxes /= ratio
+    keep = nms(boxes, scores, iou)
+    return _to_dets(boxes[keep], scores[keep], frame_shape)
+
+def postprocess_darknet(outs, frame_shape, conf=DETECTOR_CONF, iou=DETECTOR_IOU):
+    """Salidas YOLOv3 darknet (N, 5+nc) normalizadas a la imagen completa."""
+    pred = np.concatenate([o.reshape(-1, o.shape[-1]) for o in outs], axis=0)
+    # misma regla que el detector_pc.py original: clase dominante = persona y
+    # su score de clase (sin multiplicar por objectness) > conf
+    scores = pred[:, 5 + PERSON_CLASS]
+    m = (scores > conf) & (pred[:, 5:].argmax(axis=1) == PERSON_CLASS)
+    if not m.any():
+        return []
+    h, w = frame_shape[:2]
+    c, scores = pred[m, :4] * np.array([w, h, w, h], dtype=np.float32), scores[m]
+    boxes = np.concatenate([c[:, :2] - c[:, 2:] / 2, c[:, :2] + c[:, 2:] / 2], axis=1)
+    keep = nms(boxes, scores, iou)
+    return _to_dets(boxes[keep], scores[keep], frame_shape)
+
+# ----------------------- Backends -----------------------
+class UltralyticsDetector:
+    """PyTorch (.pt) u OpenVINO (directorio *_openvino_model) vía ultralytics."""
+    def __init__(self, weights, imgsz=DETECTOR_IMGSZ, conf=DETECTOR_CONF, name="torch"):
+        from ultralytics import YOLO
+        self.name = name
+        self.imgsz = imgsz
+        self.conf = conf
+        self.model = YOLO(str(weights), task="detect")
+
+    def detect(self, frame):
+        dets = []
+        for r in self.model(frame, imgsz=self.imgsz, classes=[PERSON_CLASS], verbose=False):
+            boxes = r.boxes.xyxy.cpu().numpy()
+            confs = r.boxes.conf.cpu().numpy()
+            clss = r.boxes.cls.cpu().numpy()
+            for (x1,y1,x2,y2),conf,cls in zip(boxes, confs, clss):
+                if int(cls)==PERSON_CLASS and conf>self.conf:
+                    dets.append([int(x1),int(y1),int(x2),int(y2),float(conf),int(cls)])
+        return dets
+
+class OnnxRuntimeDetector:
+    def __init__(self, onnx_path, imgsz=DETECTOR_IMGSZ, conf=DETECTOR_CONF, iou=DETECTOR_IOU):
+        import onnxruntime as ort
+        self.name = "onnxruntime"
+        self.imgsz, self.conf, self.iou = imgsz, conf, iou
+        so = ort.SessionOptions()
+        so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if ORT_THREADS:
+            so.intra_op_num_threads = ORT_THREADS
+        avail = ort.get_available_providers()
+        providers = [p for p in ("OpenVINOExecutionProvider", "CPUExecutionProvider") if p in avail]
+        self.sess = ort.InferenceSession(str(onnx_path), sess_options=so, providers=providers)
+        self.input_name = self.sess.get_inputs()[0].name
+
+    def detect(self, frame):
+        img, r, pad = letterbox(frame, self.imgsz)
+        blob = cv2.dnn.blobFromImage(img, 1/255.0, swapRB=True)
+        out = self.sess.run(None, {self.input_name: blob})[0]
+        return postprocess_v8(out, frame.shape, r, pad, self.conf, self.iou)
+
+class OpenCVDnnDetector:
+    """cv2.dnn con ONNX exportado (YOLOv8) o darknet YOLOv3 (.weights + .cfg, como detector_pc.py).
+    cv2.dnn.Net no es thread-safe: setInput/forward se serializan con un lock
+    porque todos los CameraWorker comparten el mismo detector."""
+    def __init__(self, model_path, cfg=None, imgsz=DETECTOR_IMGSZ, conf=DETECTOR_CONF, iou=DETECTOR_IOU):
+        self.name = "opencv"
+        self._lock = threading.Lock()
+        self.imgsz, self.conf, self.iou = imgsz, conf, iou
+        self.darknet = str(model_path).endswith(".weights")
+        if self.darknet:
+            self.net = cv2.dnn.readNet(str(model_path), str(cfg or Path(model_path).with_suffix(".cfg")))
+            names = self.net.getLayerNames()
+            self.out_layers = [names[i - 1] for i in np.asarray(self.net.getUnconnectedOutLayers()).flatten()]
+        else:
+            self.net = cv2.dnn.readNetFromONNX(str(model_path))
+            self.out_layers = None
+        self.net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+        self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+
+    def detect(self, frame):
+        if self.darknet:
+            blob = cv2.dnn.blobFromImage(frame, 1/255.0, (self.imgsz, self.imgsz), (0, 0, 0), True, crop=False)
+            with self._lock:
+                self.net.setInput(blob)
+                outs = self.net.forward(self.out_layers)
+            return postprocess_darknet(outs, frame.shape, self.conf, self.iou)
+        img, r, pad = letterbox(frame, self.imgsz)
+        blob = cv2.dnn.blobFromImage(img, 1/255.0, swapRB=True)
+        with self._lock:
+            self.net.setInput(blob)
+            out = self.net.forward()
+        return postprocess_v8(out, frame.shape, r, pad, self.conf, self.iou)
+
+def create_detector(backend=DETECTOR_BACKEND, weights="yolov8n.pt", imgsz=DETECTOR_IMGSZ,
+                    conf=DETECTOR_CONF, iou=DETECTOR_IOU, int8=DETECTOR_INT8):
+    """Crea el backend pedido; si falta su dependencia cae a torch (ultralytics)."""
+    backend = (backend or "torch").lower()
+    t = time.perf_counter()
+    try:
+        if backend == "onnxruntime":
+            det = OnnxRuntimeDetector(export_onnx(weights, imgsz, int8), imgsz, conf, iou)
+        elif backend == "opencv":
+            if int8:
+                print("OpenCV DNN no soporta ONNX INT8 dinámico; usando FP32")
+            path = weights if str(weights).endswith(".weights") else export_onnx(weights, imgsz, False)
+            det = OpenCVDnnDetector(path, imgsz=imgsz, conf=conf, iou=iou)
+        elif backend == "openvino":
+            det = UltralyticsDetector(export_openvino(weights, imgsz, int8), imgsz, conf, name="openvino")
+        else:
+            det = UltralyticsDetector(weights, imgsz, conf)
+    except Exception as e:
+        if backend == "torch":
+            raise
+        print(f"Backend '{backend}' no disponible ({e}); usando torch")
+        det = UltralyticsDetector(weights, imgsz, conf)
+    print(f"Detector: {det.name} ({round(time.perf_counter() - t, 2)}s)")
+    return det
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+fake_sink.py - Sustitutos locales de Telegram y del endpoint de subida
+
+Usos:
+  python fake_sink.py [puerto]     # por defecto 8765
+
+Apuntar app.py al sink:
+  TELEGRAM_API=http://127.0.0.1:8765 TELEGRAM_TOKEN=x TELEGRAM_CHAT=1
+  UPLOAD_METHOD=http UPLOAD_URL=http://127.0.0.1:8765/upload
+
+GET /stats devuelve contadores desde el último reset; POST /reset los pone a
+cero. SINK_DELAY_MS añade latencia artificial a cada respuesta (red lenta).
+"""
+import os, sys, time, threading
+
+from flask import Flask, jsonify, request
+
+SINK_DELAY_MS = float(os.getenv("SINK_DELAY_MS", "0"))
+
+sink = Flask("fake_sink")
+_lock = threading.Lock()
+_stats = {}
+
+def reset():
+    with _lock:
+        _stats.clear()
+        _stats.update({"since": time.time(), "telegram_messages": 0, "telegram_photos": 0,
+                       "uploads": 0, "upload_bytes": 0})
+
+def stats():
+    with _lock:
+        s = dict(_stats)
+    s["window_s"] = round(time.time() - s["since"], 2)
+    return s
+
+def _hit(key, nbytes=0):
+    if SINK_DELAY_MS:
+        time.sleep(SINK_DELAY_MS / 1000)
+    with _lock:
+        _stats[key] += 1
+        if nbytes:
+            _stats["upload_bytes"] += nbytes
+
+reset()
+
+@sink.route("/bot<token>/sendMessage", methods=["POST"])
+def tg_message(token):
+    _hit("telegram_messages")
+    return jsonify({"ok": True, "result": {"message_id": 1}})
+
+@sink.route("/bot<token>/sendPhoto", methods=["POST"])
+def tg_photo(token):
+    _hit("telegram_photos")
+    return jsonify({"ok": True, "result": {"message_id": 1}})
+
+@sink.route("/upload/<path:name>", methods=["PUT", "POST"])
+def upload(name):
+    _hit("uploads", len(request.get_data()))
+    return jsonify({"ok": True, "name": name})
+
+@sink.route("/stats")
+def api_stats():
+    return jsonify(stats())
+
+@sink.route("/reset", methods=["POST"])
+def api_reset():
+    reset()
+    return jsonify({"ok": True})
+
+def start(port=8765, host="127.0.0.1"):
+    """Arranca el sink en un hilo; devuelve el servidor (srv.shutdown() para parar)."""
+    from werkzeug.serving import make_server
+    srv = make_server(host, port, sink, threaded=True)
+    threading.Thread(target=srv.serve_forever, name="fake_sink", daemon=True).start()
+    return srv
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    print(f"fake_sink escuchando en http://127.0.0.1:{port}")
+    sink.run(host="127.0.0.1", port=port, threaded=True)
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+framebus.py - Bus de frames en memoria compartida (uno por cámara)
+
+Anillo de N slots de tamaño fijo en multiprocessing.shared_memory. El worker
+decodifica cada frame una sola vez directamente en un slot (cap.read(view)) y
+todos los consumidores (detección, preview, evidencias, snapshots de la API,
+otros procesos) leen el mismo buffer sin copia.
+
+Cabecera (int64):
+  global: magic, slots, capacidad(bytes/slot), último slot, último seq, descartados
+  slot:   seq (0 vacío, -1 escribiendo), refs, h, w, c, ts_ns, hold_ns, gen
+
+Consumidores del proceso productor: latest() retiene el slot (refs, protegido
+por un lock del proceso) y el productor no lo sobrescribe hasta release(). Si
+todos están retenidos el frame se descarta (contador "descartados"). Una
+retención más antigua que FRAMEBUS_LEASE_S se considera filtrada (consumidor
+que nunca llamó a release) y el productor recupera el slot.
+
+Procesos externos (FrameBus.attach) no tocan refs: leen como seqlock. El
+productor pone seq = -1 antes de escribir un slot, así que un frame es válido
+si su seq no cambió entre antes y después de usarlo: copy_latest() copia y
+re-comprueba; con latest() hay que llamar a FrameRef.valid() tras usar el frame.
+latest() devuelve None también mientras el último slot se reescribe: si
+has_frames() es True, es un reintento, no "sin frames".
+
+Uso desde otro proceso:
+  bus = FrameBus.attach("Webcam Local")
+  frame, ts = bus.copy_latest() or (None, None)
+"""
+import os, time, hashlib, threading
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+FRAMEBUS_SLOTS = int(os.getenv("FRAMEBUS_SLOTS", "4"))
+FRAMEBUS_LEASE_S = float(os.getenv("FRAMEBUS_LEASE_S", "10"))
+
+MAGIC = 0x43435456  # "CCTV"
+_G, _S = 8, 8  # int64 por cabecera global / por slot
+G_MAGIC, G_SLOTS, G_CAP, G_LAST_SLOT, G_LAST_SEQ, G_DROPPED = range(6)
+S_SEQ, S_REFS, S_H, S_W, S_C, S_TS, S_HOLD, S_GEN = range(8)
+
+BUSES = {}  # cam_id -> FrameBus (productores de este proceso)
+
+def bus_name(cam_id):
+    return "cctv_" + hashlib.md5(str(cam_id).encode("utf-8")).hexdigest()[:12]
+
+def get_bus(cam_id):
+    """Bus de la cámara: el del proceso actual o, si no, adjuntado por nombre."""
+    bus = BUSES.get(str(cam_id))
+    if bus is not None:
+        return bus
+    try:
+        return FrameBus.attach(cam_id)
+    except (FileNotFoundError, ValueError):
+        return None
+
+def _open_existing(name):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # py3.13+
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        # evitar que el resource_tracker de este proceso borre el segmento al salir
+        try:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, "shared_memory")
+        except Exception:
+            pass
+        return shm
+
+class FrameRef:
+    """Frame en un slot. Liberar con release() o usar como context manager.
+    gen=None: lectura remota sin retención (comprobar valid() tras usar el frame)."""
+    def __init__(self, bus, slot, seq, array, ts_ns, gen=None):
+        self.bus, self.slot, self.seq, self.array, self.gen = bus, slot, seq, array, gen
+        self.ts = ts_ns / 1e9
+        self._released = False
+
+    def valid(self):
+        hdr = self.bus.hdr
+        return hdr is not None and int(hdr[_G + _S*self.slot + S_SEQ]) == self.seq
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self.array = None
+            if self.gen is not None:
+                self.bus._release(self.slot, self.gen)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+class FrameBus:
+    def __init__(self, cam_id, capacity=0, slots=FRAMEBUS_SLOTS, create=True):
+        self.cam_id = str(cam_id)
+        self.name = bus_name(cam_id)
+        self.owner = create
+        self._lock = threading.Lock()
+        self._next = 0
+        self._shape = None
+        if create:
+            try:  # restos de una ejecución anterior / worker anterior de la misma cámara
+                old = shared_memory.SharedMemory(name=self.name); old.close(); old.unlink()
+            except FileNotFoundError:
+                pass
+            self.shm = shared_memory.SharedMemory(name=self.name, create=True, size=self._data_off(slots) + slots*capacity)
+            self.hdr = np.ndarray((_G + _S*slots,), np.int64, self.shm.buf)
+            self.hdr[:] = 0
+            self.hdr[G_MAGIC], self.hdr[G_SLOTS], self.hdr[G_CAP], self.hdr[G_LAST_SLOT] = MAGIC, slots, capacity, -1
+        else:
+            self.shm = _open_existing(self.name)
+            g = np.ndarray((_G,), np.int64, self.shm.buf)
+            if int(g[G_MAGIC]) != MAGIC:
+                del g; self.shm.close()
+                raise ValueError(f"{self.name} no es un FrameBus")
+            slots, capacity = int(g[G_SLOTS]), int(g[G_CAP])
+            del g
+            self.hdr = np.ndarray((_G + _S*slots,), np.int64, self.shm.buf)
+        self.slots, self.capacity = slots, capacity
+
+    @classmethod
+    def attach(cls, cam_id):
+        return cls(cam_id, create=False)
+
+    @staticmethod
+    def _data_off(slots):
+        return ((_G + _S*slots) * 8 + 63) // 64 * 64
+
+    def _slot(self, i):
+        return self.hdr[_G + _S*i : _G + _S*(i+1)]
+
+    def _view(self, i, shape):
+        return np.ndarray(shape, np.uint8, self.shm.buf, offset=self._data_off(self.slots) + i*self.capacity)
+
+    @property
+    def dropped(self):
+        return int(self.hdr[G_DROPPED])
+
+    # ----------------------- productor -----------------------
+    def _claim(self):
+        """Siguiente slot libre del anillo (refs == 0), retenido por el productor; None si no hay.
+        Si todos están retenidos, recupera el primero cuya retención superó FRAMEBUS_LEASE_S."""
+        with self._lock:
+            now = time.time_ns()
+            order = [(self._next + k) % self.slots for k in range(self.slots)]
+            i = next((j for j in order if self._slot(j)[S_REFS] == 0), None)
+            if i is None:
+                i = next((j for j in order if now - int(self._slot(j)[S_HOLD]) > FRAMEBUS_LEASE_S * 1e9), None)
+                if i is None:
+                    self.hdr[G_DROPPED] += 1
+                    return None
+                print(f"[framebus {self.cam_id}] slot {i} retenido > {FRAMEBUS_LEASE_S}s sin release(); recuperado")
+                self._slot(i)[S_GEN] += 1  # los release() de esa retención se ignoran
+            s = self._slot(i)
+            self._next = (i + 1) % self.slots
+            s[S_SEQ], s[S_REFS], s[S_HOLD] = -1, 1, now
+            return i
+
+    def _abort(self, i):
+        with self._lock:
+            s = self._slot(i)
+            s[S_SEQ], s[S_REFS] = 0, 0
+
+    def _commit(self, i, shape):
+        self._shape = shape
+        with self._lock:
+            s = self._slot(i)
+            s[S_H], s[S_W], s[S_C] = shape
+            s[S_TS] = time.time_ns()
+            seq = int(self.hdr[G_LAST_SEQ]) + 1
+            s[S_SEQ] = seq
+            self.hdr[G_LAST_SLOT], self.hdr[G_LAST_SEQ] = i, seq
+            ts, gen = int(s[S_TS]), int(s[S_GEN])
+        return FrameRef(self, i, seq, self._view(i, shape), ts, gen)
+
+    def _fit(self, frame):
+        if frame.ndim == 2:
+            frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+        if frame.nbytes <= self.capacity:
+            return frame
+        # la cámara cambió a una resolución mayor que la del slot: reducir para que quepa
+        r = (self.capacity / frame.nbytes) ** 0.5
+        h, w = frame.shape[:2]
+        return cv2.resize(frame, (max(1, int(w*r)), max(1, int(h*r))), interpolation=cv2.INTER_AREA)
+
+    def write(self, frame):
+        """Copia un frame a un slot. Devuelve FrameRef retenido por el productor o None si no hay slot libre."""
+        i = self._claim()
+        if i is None:
+            return None
+        frame = self._fit(frame)
+        view = self._view(i, frame.shape)
+        view[...] = frame
+        return self._commit(i, frame.shape)
+
+    def capture(self, cap):
+        """cap.read() decodificando directamente en un slot (sin copia).
+        Devuelve (ret, FrameRef retenido por el productor | None si se descartó)."""
+        i = self._claim()
+        if i is None:
+            return cap.grab(), None
+        if self._shape is None:
+            ret, out = cap.read()
+            view = None
+        else:
+            view = self._view(i, self._shape)
+            ret, out = cap.read(view)
+        if not ret or out is None:
+            self._abort(i)
+            return False, None
+        if view is None or not np.shares_memory(out, view):
+            # primer frame o cambio de resolución: OpenCV reservó un buffer propio
+            out = self._fit(out)
+            self._view(i, out.shape)[...] = out
+        return True, self._commit(i, out.shape)
+
+    # ----------------------- consumidores -----------------------
+    def latest(self):
+        """FrameRef (zero-copy, solo lectura) del último frame publicado, o None.
+        En el proceso productor el slot queda retenido; adjuntado desde otro proceso
+        no se retiene y hay que comprobar ref.valid() después de usar el frame."""
+        with self._lock:
+            if self.hdr is None:  # bus cerrado (cámara recargada)
+                return None
+            i = int(self.hdr[G_LAST_SLOT])
+            if i < 0:
+                return None
+            s = self._slot(i)
+            seq = int(s[S_SEQ])  # una sola lectura: es el valor que valid() compara después
+            if seq <= 0:  # el productor está reescribiendo el slot (ver has_frames())
+                return None
+            shape, ts = (int(s[S_H]), int(s[S_W]), int(s[S_C])), int(s[S_TS])
+            if shape[0] * shape[1] * shape[2] > self.capacity:  # cabecera a medio escribir (lector remoto)
+                return None
+            gen = None
+            if self.owner:
+                if s[S_REFS] == 0:
+                    s[S_HOLD] = time.time_ns()
+                s[S_REFS] += 1
+                gen = int(s[S_GEN])
+        arr = self._view(i, shape)
+        arr.flags.writeable = False
+        return FrameRef(self, i, seq, arr, ts, gen)
+
+    def has_frames(self):
+        """True si ya se publicó algún frame (aunque ahora mismo se esté reescribiendo)."""
+        hdr = self.hdr
+        return hdr is not None and int(hdr[G_LAST_SLOT]) >= 0
+
+    def copy_latest(self, retries=5):
+        """Copia validada (seqlock) del último frame: (ndarray, ts) o None. Segura desde otro proceso.
+        Un slot en reescritura cuenta como reintento; None inmediato solo si no hay frames."""
+        for _ in range(retries):
+            ref = self.latest()
+            if ref is None:
+                if not self.has_frames():
+                    return None
+                time.sleep(0.002)
+                continue
+            with ref:
+                frame = ref.array.copy()
+                ok = ref.valid()
+            if ok:
+                return frame, ref.ts
+            time.sleep(0.002)
+        return None
+
+    def _release(self, i, gen):
+        with self._lock:
+            if self.hdr is None:
+                return
+            s = self._slot(i)
+            if int(s[S_GEN]) == gen:  # si el slot fue recuperado por lease, esta retención ya no cuenta
+                s[S_REFS] = max(0, int(s[S_REFS]) - 1)
+
+    def close(self):
+        # si otro worker de la misma cámara ya creó un bus nuevo con este nombre, no borrarlo
+        unlink = self.owner and BUSES.get(self.cam_id, self) is self
+        if BUSES.get(self.cam_id) is self:
+            BUSES.pop(self.cam_id, None)
+        with self._lock:
+            self.hdr = None
+        try:
+            self.shm.close()
+        except BufferError:
+            pass  # aún hay FrameRef vivos; el mapeo se libera con ellos
+        if unlink:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+loadtest.py - Prueba de carga: cámaras sintéticas en rampa hasta violar los SLO
+
+Usos:
+  python loadtest.py --source "loop://videos/lobby.mp4?fps=15"                         # 1,2,4,8... cámaras
+  python loadtest.py --source "synthetic://1280x720@15?people=3&sprite=faces/p.jpg" --step 2 --max 40
+  python loadtest.py --source "loop://videos/lobby.mp4" --slo-p95-ms 400 --min-fps-ratio 0.9 --window 20
+
+Corre el pipeline real de app.py (detector, trackers, rostros, evidencias, DB)
+sin GUI. Telegram y la subida apuntan a fake_sink.py. En cada escalón mide:
+  - p95 de latencia captura->fin de procesamiento (SLO --slo-p95-ms)
+  - FPS capturados por cámara / FPS nominal de la fuente (SLO --min-fps-ratio)
+  - eventos (tracks confirmados -> DB/evidencias/alertas) por segundo en la
+    cámara con menos eventos (SLO --min-events-s)
+Se detiene en el primer escalón que viola un SLO e imprime la curva de
+capacidad; también la guarda en reports/loadtest_<ts>.csv.
+
+La fuente debe producir personas detectables (synthetic:// con sprite= o
+loop:// con un video real): si los frames procesados no dan ninguna
+detección el escalón falla, porque sin detecciones no se ejercitan tracking,
+rostros, evidencias, DB ni alertas y la capacidad saldría inflada. Por lo
+mismo aborta si el warm-up tuvo errores (detector, trackers o rostros).
+
+Si no hay rostros registrados se añade en memoria uno de referencia ficticio:
+así face_encodings/face_distance corren en cada track sin reconocer a nadie
+y todos los eventos siguen generando evidencias y alertas.
+"""
+import argparse, csv, os, sys, time
+
+def ramp(start, step, maximum):
+    n = start
+    while n <= maximum:
+        yield n
+        n = n + step if step else n * 2
+
+def main():
+    ap = argparse.ArgumentParser(description="Prueba de carga con cámaras sintéticas")
+    ap.add_argument("--source", required=True,
+                    help="fuente por cámara con personas detectables: loop://<video> o synthetic://...&sprite=<imagen>")
+    ap.add_argument("--start", type=int, default=1)
+    ap.add_argument("--step", type=int, default=0, help="incremento de cámaras; 0 = duplicar")
+    ap.add_argument("--max", type=int, default=64)
+    ap.add_argument("--warm", type=float, default=5, help="segundos de estabilización por escalón")
+    ap.add_argument("--window", type=float, default=15, help="segundos de medición por escalón")
+    ap.add_argument("--slo-p95-ms", type=float, default=500)
+    ap.add_argument("--min-fps-ratio", type=float, default=0.9)
+    ap.add_argument("--min-events-s", type=float, default=0.5, help="eventos/s mínimos por cámara")
+    ap.add_argument("--sink-port", type=int, default=8765)
+    args = ap.parse_args()
+
+    import fake_sink
+    srv = fake_sink.start(args.sink_port)
+    sink_url = f"http://127.0.0.1:{args.sink_port}"
+    # app.py lee la configuración al importarse: forzar alertas y subidas al sink
+    # local aunque el entorno (p.ej. producción) tenga Telegram/S3/rclone reales
+    os.environ.update({
+        "TELEGRAM_API": sink_url, "TELEGRAM_TOKEN": "loadtest", "TELEGRAM_CHAT": "1",
+        "UPLOAD_METHOD": "http", "UPLOAD_URL": f"{sink_url}/upload", "TTS_ENABLED": "false",
+    })
+
+    import cv2
+    import numpy as np
+    import app
+    from PyQt5 import QtCore
+    qapp = QtCore.QCoreApplication(sys.argv)  # QThread sin GUI
+
+    app.ensure_db()
+    app.start_warmup()
+    print("Warm-up...")
+    app.warmup_done.wait()
+    if app.warmup_errors or app.model is None or not (app.use_bytetrack or app.use_deepsort):
+        srv.shutdown()
+        errs = "; ".join(f"{k}: {v}" for k, v in app.warmup_errors.items()) or "detector o tracker no disponible"
+        sys.exit(f"ERROR: warm-up incompleto ({errs}); sin el pipeline completo la capacidad medida no es válida")
+    if app.known_encodings:
+        print(f"Rostros: {len(app.known_encodings)} registrados")
+    else:
+        # referencia que no coincide con nadie: ejercita el matching y deja todos como desconocidos
+        app.known_encodings = [np.full(128, 10.0)]
+        app.known_meta = [{"name": "loadtest", "role": "Empleado", "path": ""}]
+        print("Rostros: ninguno registrado; usando una referencia ficticia (todos los tracks quedan como desconocidos)")
+
+    sep = "&" if "?" in args.source else "?"
+    workers, rows = [], []
+    try:
+        for n in ramp(args.start, args.step, args.max):
+            while len(workers) < n:
+                i = len(workers)
+                src = f"{args.source}{sep}seed={i}" if args.source.startswith("synthetic://") else args.source
+                w = app.CameraWorker(f"load_{i:03d}", src)
+                w.set_view(preview=False)
+                w.start()
+                workers.append(w)
+            time.sleep(args.warm)
+            app.pipeline_stats.reset(); fake_sink.reset()
+            skipped0 = sum(getattr(w.cap, "skipped", 0) for w in workers)
+            cpu0, t0 = os.times(), time.time()
+            time.sleep(args.window)
+            snap = app.pipeline_stats.snapshot()
+            cpu1, dt = os.times(), time.time() - t0
+            sink = fake_sink.stats()
+
+            nominal = workers[0].cap.get(cv2.CAP_PROP_FPS) or 15.0
+            cams = snap["cameras"].values()
+            fps_ratio = min((c["captured_fps"] / nominal for c in cams), default=0.0)
+            p95 = snap["total"]["p95_ms"]
+            processed = sum(c["processed"] for c in cams)
+            detections = sum(c["detections"] for c in cams)
+            events_s = min((c["events"] / dt for c in cams), default=0.0)
+            lat_ok = p95 is not None and p95 <= args.slo_p95_ms
+            ok = lat_ok and fps_ratio >= args.min_fps_ratio and events_s >= args.min_events_s
+            row = {
+                "cameras": n,
+                "p50_ms": snap["total"]["p50_ms"], "p95_ms": p95, "max_ms": snap["total"]["max_ms"],
+                "min_fps_ratio": round(fps_ratio, 3),
+                "processed_fps_total": round(sum(c["processed_fps"] for c in cams), 1),
+                "dets_per_frame": round(detections / processed, 2) if processed else 0.0,
+                "min_events_s": round(events_s, 2),
+                "faces_s": round(sum(c["faces"] for c in cams) / dt, 2),
+                "skipped_frames": sum(getattr(w.cap, "skipped", 0) for w in workers) - skipped0,
+                "cpu_pct": round(100 * ((cpu1.user - cpu0.user) + (cpu1.system - cpu0.system)) / dt, 1),
+                "alerts_s": round((sink["telegram_messages"] + sink["telegram_photos"]) / dt, 2),
+                "uploads_s": round(sink["uploads"] / dt, 2),
+                "slo_ok": ok,
+            }
+            rows.append(row)
+            print(" ".join(f"{k}={v}" for k, v in row.items()))
+            if processed and not detections:
+                print("ERROR: la fuente no produce detecciones de personas; usa synthetic://...&sprite=<imagen> "
+                      "o loop://<video con personas>")
+                break
+            if detections and not any(c["events"] for c in cams):
+                print("ERROR: hay detecciones pero ningún track confirmado; no se generan eventos ni alertas")
+                break
+            if not ok:
+                break
+    finally:
+        for w in workers:
+            w.stop()
+        for w in workers:
+            w.wait(5000)
+        srv.shutdown()
+
+    if not rows:
+        return
+    passing = [r["cameras"] for r in rows if r["slo_ok"]]
+    if rows[-1]["slo_ok"]:
+        capacity = f">= {rows[-1]['cameras']} cámaras (no se violó ningún SLO hasta --max)"
+    else:
+        capacity = f"{max(passing) if passing else 0} cámaras"
+    print()
+    print("Curva de capacidad:")
+    cols = list(rows[0].keys())
+    print(" | ".join(f"{c:>19}" for c in cols))
+    for r in rows:
+        print(" | ".join(f"{str(r[c]):>19}" for c in cols))
+    print(f"\nCapacidad: {capacity} "
+          f"(SLO p95 <= {args.slo_p95_ms} ms, fps >= {args.min_fps_ratio:.0%} del nominal, "
+          f">= {args.min_events_s} eventos/s por cámara)")
+    out = app.REPORTS_DIR / f"loadtest_{time.strftime('%Y%m%d_%H%M%S')}.csv"
+    with open(out, "w", newline="", encoding="utf-8") as f:
+        wr = csv.DictWriter(f, fieldnames=cols)
+        wr.writeheader()
+        wr.writerows(rows)
+    print("Resultados en", out)
+
+if __name__ == "__main__":
+    main()
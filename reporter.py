@@ -10,13 +10,9 @@ import sqlite3
 import time
 import sys
 from pathlib import Path
-import pandas as pd
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib import colors
-import matplotlib.pyplot as plt
-from jinja2 import Template
+
+# pandas / reportlab / matplotlib / jinja2 se importan dentro de cada función:
+# importar reporter.py (o lanzarlo desde app.py) no paga ese coste de arranque.
 
 BASE = Path(__file__).parent
 DB = BASE / "people.db"
@@ -24,12 +20,20 @@ OUT = BASE / "reports"
 OUT.mkdir(parents=True, exist_ok=True)
 
 def fetch_events(limit=1000):
+    import pandas as pd
     conn = sqlite3.connect(DB)
     df = pd.read_sql("SELECT * FROM events ORDER BY id DESC LIMIT ?", conn, params=(limit,))
     conn.close()
     return df
 
 def gen_pdf(df, outpath):
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib import colors
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
     doc = SimpleDocTemplate(str(outpath), pagesize=A4)
     styles = getSampleStyleSheet()
     elems = []
@@ -69,6 +73,7 @@ def gen_pdf(df, outpath):
     doc.build(elems)
 
 def gen_html(df, outpath):
+    from jinja2 import Template
     tpl = Template("""
     <html><head><meta charset="utf-8"><title>Reporte CCTV</title>
     <link rel="stylesheet" href="https://cdn.datatables.net/1.13.4/css/jquery.dataTables.min.css"/>
@@ -84,13 +89,21 @@ def gen_html(df, outpath):
     outpath.write_text(html, encoding="utf-8")
 
 def generate_all():
+    timings = {}
+    t = time.perf_counter()
     df = fetch_events(limit=5000)
+    timings["fetch"] = round(time.perf_counter() - t, 3)
     ts = time.strftime("%Y%m%d_%H%M%S")
     pdf_path = OUT / f"report_{ts}.pdf"
     html_path = OUT / f"report_{ts}.html"
+    t = time.perf_counter()
     gen_pdf(df, pdf_path)
+    timings["pdf"] = round(time.perf_counter() - t, 3)
+    t = time.perf_counter()
     gen_html(df, html_path)
+    timings["html"] = round(time.perf_counter() - t, 3)
     print("Reportes generados:", pdf_path, html_path)
+    print("Tiempos (s):", timings)
 
 if __name__ == "__main__":
     mode = sys.argv[1] if len(sys.argv) > 1 else "once"
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+synthetic.py - Fuentes de cámara sintéticas (pruebas de carga / dimensionamiento)
+
+Se declaran en cameras.json como "source":
+  synthetic://1280x720@15?people=3&seed=1              frames generados con personas guionizadas
+  synthetic://640x480@10?people=2&sprite=faces/p.jpg   personas = imagen pegada (para que YOLO las detecte)
+  loop://videos/lobby.mp4?fps=15                       archivo en bucle (fps del archivo si se omite)
+
+Imitan cv2.VideoCapture (isOpened/read/grab/get/release) y entregan frames al
+ritmo de una cámara en vivo: si el consumidor se retrasa, los frames intermedios
+se pierden (como en RTSP) y se cuentan en .skipped.
+"""
+import time
+from urllib.parse import parse_qs
+
+import cv2
+import numpy as np
+
+SCHEMES = ("synthetic://", "loop://")
+
+def is_synthetic(src):
+    return isinstance(src, str) and src.startswith(SCHEMES)
+
+def open_source(src):
+    """cv2.VideoCapture para fuentes reales; captura sintética para synthetic:// y loop://."""
+    if not is_synthetic(src):
+        return cv2.VideoCapture(src)
+    scheme, rest = src.split("://", 1)
+    target, _, query = rest.partition("?")
+    q = {k: v[-1] for k, v in parse_qs(query).items()}
+    if scheme == "loop":
+        return LoopingFileCapture(target, fps=float(q["fps"]) if "fps" in q else None)
+    size, _, fps = target.partition("@")
+    w, _, h = (size or "1280x720").partition("x")
+    return SyntheticCapture(int(w), int(h), float(fps or 15), people=int(q.get("people", 3)),
+                            seed=int(q.get("seed", 0)), sprite=q.get("sprite"))
+
+class _LiveClock:
+    """Ritmo de cámara en vivo: índice de frame según el reloj de pared."""
+    def __init__(self, fps):
+        self.fps = fps
+        self.t0 = None
+        self.last = -1
+        self.skipped = 0
+
+    def next_index(self):
+        now = time.perf_counter()
+        if self.t0 is None:
+            self.t0 = now
+        idx = int((now - self.t0) * self.fps)
+        if idx <= self.last:
+            idx = self.last + 1
+            time.sleep(max(0.0, self.t0 + idx / self.fps - now))
+        else:
+            self.skipped += idx - self.last - 1
+        self.last = idx
+        return idx
+
+def _bounce(p, length):
+    m = p % (2 * length) if length > 0 else 0
+    return m if m <= length else 2 * length - m
+
+class SyntheticCapture:
+    def __init__(self, width=1280, height=720, fps=15, people=3, seed=0, sprite=None):
+        self.width, self.height, self.fps = width, height, fps
+        self.shape = (height, width, 3)
+        self.clock = _LiveClock(fps)
+        self.opened = True
+        rng = np.random.default_rng(seed)
+        # fondo estático (gradiente + textura) calculado una vez
+        gy = np.linspace(40, 140, height, dtype=np.float32)[:, None, None]
+        gx = np.linspace(0, 60, width, dtype=np.float32)[None, :, None]
+        noise = rng.integers(0, 20, self.shape, dtype=np.uint8)
+        self.bg = np.clip(gy + gx + noise, 0, 255).astype(np.uint8)
+        img = cv2.imread(sprite) if sprite else None
+        self.people = []
+        for _ in range(people):
+            ph = int(height * rng.uniform(0.35, 0.6)); pw = max(1, ph * 2 // 5)
+            self.people.append({
+                "w": pw, "h": ph,
+                "x0": rng.uniform(0, width), "y0": rng.uniform(0, height),
+                "vx": rng.uniform(-0.25, 0.25) * width, "vy": rng.uniform(-0.05, 0.05) * height,  # px/s
+                "color": tuple(int(c) for c in rng.integers(30, 220, 3)),
+                "sprite": cv2.resize(img, (pw, ph), interpolation=cv2.INTER_AREA) if img is not None else None,
+            })
+
+    @property
+    def skipped(self):
+        return self.clock.skipped
+
+    def _render(self, idx, out):
+        out[...] = self.bg
+        t = idx / self.fps
+        for p in self.people:
+            w, h = p["w"], p["h"]
+            x = int(_bounce(p["x0"] + p["vx"] * t, self.width - w))
+            y = int(_bounce(p["y0"] + p["vy"] * t, self.height - h))
+            if p["sprite"] is not None:
+                out[y:y+h, x:x+w] = p["sprite"][:self.height-y, :self.width-x]
+                continue
+            head = h // 7
+            cv2.circle(out, (x + w//2, y + head), head, (140, 170, 220), -1)
+            cv2.rectangle(out, (x + w//6, y + 2*head), (x + 5*w//6, y + 4*h//7), p["color"], -1)
+            cv2.rectangle(out, (x + w//4, y + 4*h//7), (x + w//2 - 2, y + h), (60, 50, 40), -1)
+            cv2.rectangle(out, (x + w//2 + 2, y + 4*h//7), (x + 3*w//4, y + h), (60, 50, 40), -1)
+        cv2.putText(out, f"SYN {idx}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+
+    def read(self, image=None):
+        if not self.opened:
+            return False, None
+        idx = self.clock.next_index()
+        ok = image is not None and image.shape == self.shape and image.dtype == np.uint8
+        out = image if ok else np.empty(self.shape, np.uint8)
+        self._render(idx, out)
+        return True, out
+
+    def grab(self):
+        self.clock.next_index()
+        return self.opened
+
+    def get(self, prop):
+        return {cv2.CAP_PROP_FPS: self.fps, cv2.CAP_PROP_FRAME_WIDTH: self.width,
+                cv2.CAP_PROP_FRAME_HEIGHT: self.height}.get(prop, 0.0)
+
+    def isOpened(self):
+        return self.opened
+
+    def release(self):
+        self.opened = False
+
+class LoopingFileCapture:
+    def __init__(self, path, fps=None):
+        self.cap = cv2.VideoCapture(path)
+        self.fps = fps or self.cap.get(cv2.CAP_PROP_FPS) or 15.0
+        self.frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        self.clock = _LiveClock(self.fps)
+
+    @property
+    def skipped(self):
+        return self.clock.skipped
+
+    def _read(self, image):
+        return self.cap.read(image) if image is not None else self.cap.read()
+
+    def _grab(self):
+        if not self.cap.grab():  # fin de archivo: volver al inicio
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            return self.cap.grab()
+        return True
+
+    def _advance(self):
+        """Avanza el reloj y descarta del archivo los frames que dio por perdidos,
+        para que el siguiente frame leído sea el que tocaría en vivo."""
+        before = self.clock.skipped
+        idx = self.clock.next_index()
+        missed = self.clock.skipped - before
+        if missed <= 0:
+            return
+        if self.frames > 0 and missed > self.fps:  # salto largo: seek directo
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, idx % self.frames)
+        else:
+            for _ in range(missed):
+                self._grab()
+
+    def read(self, image=None):
+        self._advance()
+        ret, frame = self._read(image)
+        if not ret:  # fin de archivo: volver al inicio
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self._read(image)
+        return ret, frame
+
+    def grab(self):
+        self._advance()
+        return self._grab()
+
+    def get(self, prop):
+        return self.fps if prop == cv2.CAP_PROP_FPS else self.cap.get(prop)
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()